@@ -1,17 +1,21 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for, flash, abort
+import click
+from flask import Flask, render_template, request, redirect, url_for, flash, abort, current_app
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-from flask_bcrypt import Bcrypt
-from flask_migrate import Migrate
+from jinja2 import FileSystemBytecodeCache
 from sqlalchemy.orm import joinedload
 from sqlalchemy.exc import IntegrityError
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
 
 from models import db, User, Skill, Swap, UserSkill
 from matching import find_matches_for_user
+from recommendations import refresh_skill_neighbors, recommended_skills_for_user
+from async_db import init_async_db, dashboard_data
+from ratelimit import init_ratelimit, too_many_attempts
+from profiling import init_profiling
 from config import Config
 
-bcrypt = Bcrypt()
 login_manager = LoginManager()
 login_manager.login_view = "login"
 
@@ -21,16 +25,85 @@ def load_user(user_id):
     return db.session.get(User, int(user_id))
 
 
-def create_app():
+def get_bcrypt():
+    """Flask-Bcrypt for the current app, imported on the first password hash/check."""
+    ext = current_app.extensions.get("bcrypt")
+    if ext is None:
+        from flask_bcrypt import Bcrypt
+        ext = current_app.extensions["bcrypt"] = Bcrypt(current_app)
+    return ext
+
+
+def init_migrate(app):
+    """Register Flask-Migrate (and the `flask db` commands). Pulls in Alembic."""
+    from flask_migrate import Migrate
+    Migrate(app, db)
+
+
+def create_app(migrate=None, async_reads=None, config=None):
+    """Build the app.
+
+    Alembic is only imported when `migrate` is true, which defaults to "running
+    under the flask CLI" so `flask db ...` keeps working while gunicorn workers
+    skip it. Scripts that call `flask_migrate.upgrade()` pass `migrate=True`.
+
+    `async_reads` (default: Config.ASYNC_READS) sets up the async engine used by
+    the dashboard's concurrent read path; asgi.py turns it on.
+
+    `config` overrides settings after Config is loaded (the tests use it).
+    """
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+    if async_reads is not None:
+        app.config["ASYNC_READS"] = async_reads
+
+    # Compiled templates are cached on disk; deploy.py warms the cache
+    cache_dir = app.config["TEMPLATE_CACHE_DIR"] or os.path.join(app.instance_path, "jinja_cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": FileSystemBytecodeCache(cache_dir)}
+
+    if app.config["TRUSTED_PROXIES"]:
+        n = app.config["TRUSTED_PROXIES"]
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=n, x_proto=n)
 
     db.init_app(app)
-    bcrypt.init_app(app)
     login_manager.init_app(app)
+    init_ratelimit(app)
+    init_profiling(app)
 
     # ✅ Flask-Migrate
-    Migrate(app, db)
+    if migrate is None:
+        migrate = click.get_current_context(silent=True) is not None
+    if migrate:
+        init_migrate(app)
+
+    if app.config["ASYNC_READS"]:
+        init_async_db(app)
+
+    @app.cli.command("rebuild-recommendations")
+    def rebuild_recommendations():
+        """Recompute the whole skill co-occurrence index.
+
+        /profile keeps it current on its own; run this after changing user skills
+        any other way (imports, manual SQL, restoring a backup).
+        """
+        refresh_skill_neighbors()
+        db.session.commit()
+        click.echo("✅ Skill recommendations rebuilt")
+
+    @app.cli.command("set-admin")
+    @click.argument("email")
+    @click.option("--revoke", is_flag=True, help="Remove admin rights instead.")
+    def set_admin(email, revoke):
+        """Grant (or revoke) admin rights, e.g. /_profiling, to a registered user."""
+        u = User.query.filter(db.func.lower(User.email) == email.strip().lower()).first()
+        if not u:
+            raise click.ClickException(f"No registered user with email {email}")
+        u.is_admin = not revoke
+        db.session.commit()
+        click.echo(f"✅ {u.email} is {'no longer' if revoke else 'now'} an admin")
 
     # ---------------- ROUTES ---------------- #
 
@@ -61,24 +134,25 @@ def create_app():
 
         skills = query.all()
 
-        matches = []
+        recommended = []
         if current_user.is_authenticated:
-            matches = (
-                UserSkill.query.options(joinedload(UserSkill.skill))
-                .filter(UserSkill.user_id != current_user.id)
-                .limit(6)
-                .all()
-            )
+            recommended = recommended_skills_for_user(current_user.id, limit=6)
 
-        return render_template("explore.html", skills=skills, matches=matches)
+        return render_template("explore.html", skills=skills, recommended=recommended)
 
     # ---------- REGISTER ---------- #
     @app.route("/register", methods=["GET", "POST"])
     def register():
         if request.method == "POST":
+            # Before any DB or bcrypt work
+            retry_after = too_many_attempts((f"register-ip:{request.remote_addr}", "RATELIMIT_REGISTER_IP"))
+            if retry_after:
+                flash("Too many sign-ups from your network. Please try again later.", "error")
+                return render_template("auth_register.html"), 429, {"Retry-After": str(retry_after)}
+
             name = request.form["name"]
             email = request.form["email"]
-            pw = bcrypt.generate_password_hash(request.form["password"]).decode("utf-8")
+            pw = get_bcrypt().generate_password_hash(request.form["password"]).decode("utf-8")
 
             if User.query.filter_by(email=email).first():
                 flash("Email already registered", "error")
@@ -99,8 +173,17 @@ def create_app():
             email = request.form["email"]
             pw = request.form["password"]
 
+            # Before any DB or bcrypt work
+            retry_after = too_many_attempts(
+                (f"login-ip:{request.remote_addr}", "RATELIMIT_LOGIN_IP"),
+                (f"login-email:{email.strip().lower()}", "RATELIMIT_LOGIN_EMAIL"),
+            )
+            if retry_after:
+                flash("Too many login attempts. Please wait a minute and try again.", "error")
+                return render_template("auth_login.html"), 429, {"Retry-After": str(retry_after)}
+
             u = User.query.filter_by(email=email).first()
-            if u and bcrypt.check_password_hash(u.password_hash, pw):
+            if u and get_bcrypt().check_password_hash(u.password_hash, pw):
                 login_user(u)
                 return redirect(url_for("dashboard"))
 
@@ -117,6 +200,10 @@ def create_app():
     @app.route("/dashboard")
     @login_required
     def dashboard():
+        if app.config["ASYNC_READS"]:
+            matches, stats = dashboard_data(current_user.id, limit=8)
+            return render_template("dashboard.html", matches=matches, stats=stats)
+
         matches = find_matches_for_user(current_user.id, limit=8)
 
         offered_count = UserSkill.query.filter_by(user_id=current_user.id, relation="offer").count()
@@ -159,7 +246,9 @@ def create_app():
                     current_user.profile_pic = filename
 
             # Clear old skills
+            touched_skill_ids = set()
             for us in list(current_user.skills):
+                touched_skill_ids.add(us.skill_id)
                 db.session.delete(us)
 
             # Helper
@@ -184,6 +273,11 @@ def create_app():
                 sk = get_or_create_skill(name)
                 db.session.add(UserSkill(user_id=current_user.id, skill_id=sk.id, relation="want"))
 
+            # Keep the co-occurrence index in step with this user's old + new skills
+            db.session.flush()
+            touched_skill_ids.update(us.skill_id for us in current_user.skills)
+            refresh_skill_neighbors(touched_skill_ids)
+
             db.session.commit()
             flash("Profile updated", "success")
             return redirect(url_for("profile"))
@@ -315,8 +409,6 @@ def create_app():
     return app
 
 
-# 👇 Needed for `flask run`
-app = create_app()
-
+# `flask run` finds create_app() on its own; gunicorn uses "app:create_app()"
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,17 @@
+# asgi.py — async serving mode (EXPERIMENTAL, not used by the Procfile)
+#   uvicorn asgi:app --workers 2
+#   gunicorn -k uvicorn_worker.UvicornWorker asgi:app
+#
+# Flask is still WSGI here: each request holds a pool thread for its whole lifetime,
+# including while the dashboard waits on its async reads, so this behaves like gthread
+# workers plus an event loop for the concurrent counters. Only move production to it
+# once bench_serving.py shows a gain against the real database.
+from a2wsgi import WSGIMiddleware
+
+from app import create_app
+
+flask_app = create_app(async_reads=True)
+
+# Each WSGI call runs on its own pool thread, so a request waiting on the DB
+# doesn't hold up the others in the same worker
+app = WSGIMiddleware(flask_app, workers=flask_app.config["ASGI_THREADS"])
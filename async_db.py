@@ -0,0 +1,127 @@
+"""Async SQLAlchemy engine for the dashboard's concurrent reads (ASYNC_READS).
+
+Each worker process runs one long-lived event loop on a background thread, and the
+async engine's pooled connections all belong to that loop, so they are reused across
+requests. Request threads hand their queries to the loop and wait for the results.
+"""
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import Future
+
+from flask import current_app
+from sqlalchemy import func, or_, select
+
+from models import db, Swap, UserSkill
+from matching import find_matches_for_user
+
+# Sync driver -> async driver. postgresql+psycopg needs no change: psycopg 3 is async-capable
+# and SQLAlchemy picks its async variant when the engine is created with create_async_engine.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+}
+
+_loop_lock = threading.Lock()
+_loop = None  # (pid, event loop) of this worker process
+
+
+def async_url(url):
+    """Return the SQLAlchemy URL `url` switched to an asyncio driver."""
+    return url.set(drivername=_ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+def init_async_db(app):
+    """Create the async engine and session factory for `app`."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    # Start from the sync engine's URL: Flask-SQLAlchemy has already resolved relative
+    # SQLite paths against the instance folder there
+    with app.app_context():
+        url = async_url(db.engine.url)
+
+    # Pooled for SQLite too (aiosqlite defaults to NullPool for files): every connection
+    # is opened and used on the worker's one loop, so they can be handed between requests
+    engine = create_async_engine(url, poolclass=AsyncAdaptedQueuePool)
+    app.extensions["async_db"] = async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _worker_loop():
+    """This process's event loop, started on first use (after gunicorn has forked)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop[0] != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-reads", daemon=True).start()
+            _loop = (os.getpid(), loop)
+        return _loop[1]
+
+
+def submit(coro):
+    """Run `coro` on the worker's event loop; returns a concurrent.futures.Future.
+
+    The coroutine sees the caller's context (app context, profiling state).
+    """
+    loop = _worker_loop()
+    context = contextvars.copy_context()
+    future = Future()
+
+    def finish(task):
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def start():
+        loop.create_task(coro, context=context).add_done_callback(finish)
+
+    loop.call_soon_threadsafe(start)
+    return future
+
+
+async def _scalar(stmt):
+    # One session per query: an AsyncSession can't run statements concurrently
+    async with current_app.extensions["async_db"]() as session:
+        return await session.scalar(stmt)
+
+
+async def dashboard_stats(user_id):
+    """The dashboard's four counters, queried concurrently."""
+    involved = or_(Swap.requester_id == user_id, Swap.responder_id == user_id)
+
+    def skills(relation):
+        return select(func.count()).select_from(UserSkill).where(
+            UserSkill.user_id == user_id, UserSkill.relation == relation
+        )
+
+    def swaps(status):
+        return select(func.count()).select_from(Swap).where(involved, Swap.status == status)
+
+    offered_count, wanted_count, active_requests, completed_swaps = await asyncio.gather(
+        _scalar(skills("offer")),
+        _scalar(skills("want")),
+        _scalar(swaps("pending")),
+        _scalar(swaps("completed")),
+    )
+    return {
+        "offered_count": offered_count,
+        "wanted_count": wanted_count,
+        "active_requests": active_requests,
+        "completed_swaps": completed_swaps,
+    }
+
+
+def dashboard_data(user_id, limit=8):
+    """Run find_matches_for_user alongside the stats queries; returns (matches, stats).
+
+    Matching walks ORM relationships on the request's sync session, so it stays on
+    this thread while the counts run on the worker's event loop.
+    """
+    stats = submit(dashboard_stats(user_id))
+    matches = find_matches_for_user(user_id, limit)
+    return matches, stats.result()
@@ -0,0 +1,137 @@
+# bench_ratelimit.py
+"""Legitimate-user login latency during a credential-stuffing burst, with and without rate limiting.
+
+Starts gunicorn (sync workers) on a throwaway database three times: with no
+attack (baseline), under attack with RATELIMIT_ENABLED=0, and under attack with
+it on. Attacker threads post wrong passwords for existing (victim) accounts from
+a handful of IPs while real users log in from their own IPs a few times per
+second. Prints the real users' latency and how many attacker attempts were
+turned away with 429 before reaching the database or bcrypt.
+
+Each attacking IP gets RATELIMIT_LOGIN_IP attempts before it is cut off, so use a
+duration well past that allowance to see the steady state.
+
+    python bench_ratelimit.py                        # 2 workers, 16 attackers, 60 s
+    python bench_ratelimit.py --workers 4 --attackers 32 --attack-ips 4 --duration 20
+"""
+import argparse
+import http.client
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from bench_serving import wait_until_up
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PORT = 8710
+REAL_USERS = 20
+VICTIMS = 1000
+
+
+def seed(database_url):
+    os.environ["DATABASE_URL"] = database_url
+    from flask_migrate import upgrade
+    from app import create_app, get_bcrypt
+    from models import db, User
+
+    app = create_app(migrate=True)
+    with app.app_context():
+        upgrade(directory=os.path.join(BASE_DIR, "migrations"))
+        pw = get_bcrypt().generate_password_hash("pass123").decode("utf-8")
+        db.session.add_all([User(name=f"Real {i}", email=f"real{i}@bench.test", password_hash=pw)
+                            for i in range(REAL_USERS)])
+        # Stuffed credentials only cost bcrypt when the email exists
+        db.session.add_all([User(name=f"Victim {i}", email=f"victim{i}@bench.test", password_hash=pw)
+                            for i in range(VICTIMS)])
+        db.session.commit()
+
+
+def post_login(email, password, ip):
+    """POST /login without following the redirect; returns (status, seconds)."""
+    body = urllib.parse.urlencode({"email": email, "password": password})
+    headers = {"Content-Type": "application/x-www-form-urlencoded", "X-Forwarded-For": ip}
+    conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=60)
+    start = time.perf_counter()
+    try:
+        conn.request("POST", "/login", body, headers)
+        status = conn.getresponse().status
+    finally:
+        conn.close()
+    return status, time.perf_counter() - start
+
+
+def attacker(ips, deadline, statuses):
+    rng = random.Random()
+    while time.monotonic() < deadline:
+        email = f"victim{rng.randrange(VICTIMS)}@bench.test"
+        status, _ = post_login(email, "hunter2", rng.choice(ips))
+        statuses.append(status)
+
+
+def real_users(deadline, latencies, statuses):
+    i = 0
+    while time.monotonic() < deadline:
+        status, seconds = post_login(f"real{i % REAL_USERS}@bench.test", "pass123", f"10.0.0.{i % REAL_USERS + 1}")
+        i += 1
+        latencies.append(seconds)
+        statuses.append(status)
+        time.sleep(0.25)
+
+
+def run(label, enabled, attackers, args, env):
+    env = {**env, "RATELIMIT_ENABLED": "1" if enabled else "0"}
+    cmd = ["gunicorn", "app:create_app()", "-w", str(args.workers),
+           "-b", f"127.0.0.1:{PORT}", "--log-level", "warning", "--timeout", "120"]
+    server = subprocess.Popen(cmd, cwd=BASE_DIR, env=env)
+    try:
+        wait_until_up(f"http://127.0.0.1:{PORT}")
+
+        ips = [f"203.0.113.{i + 1}" for i in range(args.attack_ips)]
+        latencies, user_statuses, attack_statuses = [], [], []
+        deadline = time.monotonic() + args.duration
+        threads = [threading.Thread(target=attacker, args=(ips, deadline, attack_statuses))
+                   for _ in range(attackers)]
+        threads.append(threading.Thread(target=real_users, args=(deadline, latencies, user_statuses)))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    print(f"{label:>8}: real users p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+          f"p95 {p95 * 1000:7.1f} ms  logged in {user_statuses.count(302)}/{len(user_statuses)}  |  "
+          f"attack attempts {len(attack_statuses)}, rejected {attack_statuses.count(429)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--attackers", type=int, default=16)
+    parser.add_argument("--attack-ips", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed(database_url)
+        env = {**os.environ, "DATABASE_URL": database_url, "TRUSTED_PROXIES": "1",
+               "TEMPLATE_CACHE_DIR": os.path.join(tmp, "jinja")}
+
+        print(f"{args.workers} workers, {args.attackers} attackers from {args.attack_ips} IPs, {args.duration:g} s")
+        for label, enabled, attackers in (("baseline", True, 0), ("open", False, args.attackers),
+                                          ("limited", True, args.attackers)):
+            env["RATELIMIT_STORAGE_PATH"] = os.path.join(tmp, f"ratelimit-{label}.sqlite")
+            run(label, enabled, attackers, args, env)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# bench_serving.py
+"""Compare /dashboard throughput: gunicorn sync workers vs the async (ASGI) mode.
+
+Seeds a throwaway database (SQLite unless --database-url points at a scratch
+Postgres), then for each mode starts gunicorn with the
+same number of worker processes (so memory is comparable), logs in one client
+per thread and hammers /dashboard for a fixed time. Prints requests/s, latency
+percentiles and the resident memory of the whole server process tree.
+
+    python bench_serving.py                          # 2 workers, 16 clients, 10 s
+    python bench_serving.py --workers 4 --clients 32 --duration 20 --users 500
+    python bench_serving.py --database-url postgresql+psycopg://user:pw@db-host/scratch
+
+The async mode only pays off when requests wait on the database; SQLite in the same
+process keeps the CPU busy instead, so use a networked Postgres to see the difference.
+Only point --database-url at a scratch database: it is migrated and seeded.
+"""
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODES = {
+    "sync": ["gunicorn", "app:create_app()"],
+    "async": ["gunicorn", "-k", "uvicorn_worker.UvicornWorker", "asgi:app"],
+}
+
+SKILLS = ["Python", "SQL", "Guitar", "Piano", "French", "Spanish", "React",
+          "Photography", "Branding", "UI/UX", "Public Speaking", "Hindi"]
+
+
+def seed(database_url, n_users):
+    """Migrate and fill a fresh database; returns the login emails."""
+    os.environ["DATABASE_URL"] = database_url
+    from flask_migrate import upgrade
+    from app import create_app, get_bcrypt
+    from models import db, User, Skill, Swap, UserSkill
+
+    app = create_app(migrate=True)
+    with app.app_context():
+        upgrade(directory=os.path.join(BASE_DIR, "migrations"))
+
+        pw = get_bcrypt().generate_password_hash("pass123").decode("utf-8")
+        skills = [Skill(name=name) for name in SKILLS]
+        users = [User(name=f"User {i}", email=f"u{i}@bench.test", password_hash=pw) for i in range(n_users)]
+        db.session.add_all(skills + users)
+        db.session.flush()
+
+        rng = random.Random(0)
+        for u in users:
+            picked = rng.sample(skills, 4)
+            db.session.add_all([UserSkill(user_id=u.id, skill_id=s.id, relation="offer") for s in picked[:2]])
+            db.session.add_all([UserSkill(user_id=u.id, skill_id=s.id, relation="want") for s in picked[2:]])
+            other = rng.choice(users)
+            if other is not u:
+                db.session.add(Swap(requester_id=u.id, responder_id=other.id,
+                                    offered_skill_id=picked[0].id, wanted_skill_id=picked[2].id,
+                                    status=rng.choice(["pending", "completed"])))
+        db.session.commit()
+        return [u.email for u in users]
+
+
+def tree_rss_kb(pid):
+    """Resident memory of `pid` and all its descendants, in kB (Linux /proc)."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except OSError:
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+
+    total, stack = 0, [pid]
+    while stack:
+        p = stack.pop()
+        stack.extend(children.get(p, []))
+        try:
+            with open(f"/proc/{p}/status") as f:
+                total += next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+        except (OSError, StopIteration):
+            pass
+    return total
+
+
+def wait_until_up(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(base_url + "/", timeout=1)
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise SystemExit(f"server at {base_url} did not start")
+
+
+def login(base_url, email):
+    """Return a URL opener holding a logged-in session cookie."""
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+    form = urllib.parse.urlencode({"email": email, "password": "pass123"}).encode()
+    opener.open(base_url + "/login", data=form, timeout=30)
+    return opener
+
+
+def client(base_url, opener, deadline, latencies, errors):
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            with opener.open(base_url + "/dashboard", timeout=30) as resp:
+                resp.read()
+            latencies.append(time.perf_counter() - start)
+        except (urllib.error.URLError, ConnectionError):
+            errors.append(1)
+
+
+def run_mode(mode, args, env, emails):
+    port = 8700 + list(MODES).index(mode)
+    base_url = f"http://127.0.0.1:{port}"
+    cmd = MODES[mode] + ["-w", str(args.workers), "-b", f"127.0.0.1:{port}", "--log-level", "warning"]
+    server = subprocess.Popen(cmd, cwd=BASE_DIR, env=env)
+    try:
+        wait_until_up(base_url)
+        rss_kb = tree_rss_kb(server.pid)
+
+        # Log everyone in first so bcrypt doesn't eat into the measured window
+        openers = [login(base_url, emails[i % len(emails)]) for i in range(args.clients)]
+
+        latencies, errors = [], []
+        deadline = time.monotonic() + args.duration
+        threads = [
+            threading.Thread(target=client, args=(base_url, opener, deadline, latencies, errors))
+            for opener in openers
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        rss_kb = max(rss_kb, tree_rss_kb(server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+    if not latencies:
+        raise SystemExit(f"{mode}: no successful requests ({len(errors)} errors)")
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    print(f"{mode:>6}: {len(latencies) / args.duration:8.1f} req/s  "
+          f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {pct(0.95):7.1f} ms  "
+          f"errors {len(errors):4d}  rss {rss_kb / 1024:7.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--database-url", help="scratch database to use instead of a temporary SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        emails = seed(database_url, args.users)
+        env = {**os.environ, "DATABASE_URL": database_url, "TEMPLATE_CACHE_DIR": os.path.join(tmp, "jinja"),
+               "RATELIMIT_ENABLED": "0"}
+
+        print(f"{args.workers} workers, {args.clients} clients, {args.duration:g} s, {args.users} users")
+        for mode in MODES:
+            run_mode(mode, args, env, emails)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,5 +19,42 @@ class Config:
     # Optional: Pagination defaults for explore/search results
     ITEMS_PER_PAGE = int(os.environ.get("ITEMS_PER_PAGE", 10))
 
+    # Where compiled Jinja bytecode is cached (default: <instance>/jinja_cache)
+    TEMPLATE_CACHE_DIR = os.environ.get("TEMPLATE_CACHE_DIR")
+
+    # How many co-occurring skills to keep per skill for /explore recommendations
+    SKILL_NEIGHBORS_TOP_N = int(os.environ.get("SKILL_NEIGHBORS_TOP_N", 20))
+
+    # Login/registration rate limits, as "<attempts>/<seconds>" sliding windows.
+    # Counters live in a SQLite file shared by all workers (default: <instance>/ratelimit.sqlite)
+    RATELIMIT_ENABLED = os.environ.get("RATELIMIT_ENABLED", "1") == "1"
+    RATELIMIT_STORAGE_PATH = os.environ.get("RATELIMIT_STORAGE_PATH")
+    RATELIMIT_LOGIN_IP = os.environ.get("RATELIMIT_LOGIN_IP", "20/60")
+    RATELIMIT_LOGIN_EMAIL = os.environ.get("RATELIMIT_LOGIN_EMAIL", "5/60")
+    RATELIMIT_REGISTER_IP = os.environ.get("RATELIMIT_REGISTER_IP", "5/600")
+    # When the counter store errors (e.g. stays locked through a burst), reject the attempt
+    # with this Retry-After rather than let unlimited attempts through, unless FAIL_OPEN=1
+    RATELIMIT_FAIL_OPEN = os.environ.get("RATELIMIT_FAIL_OPEN", "0") == "1"
+    RATELIMIT_ERROR_RETRY_AFTER = int(os.environ.get("RATELIMIT_ERROR_RETRY_AFTER", 5))
+
+    # Number of reverse proxies in front of the app, so X-Forwarded-For is trusted for the
+    # client IP. The rate limits above are keyed on that IP: behind Heroku/Render with this
+    # left at 0, every client shares the router's address and the per-IP limits become
+    # site-wide caps. The Procfile sets 1; keep 0 only when clients connect directly.
+    TRUSTED_PROXIES = int(os.environ.get("TRUSTED_PROXIES", 0))
+
+    # Opt-in profiling (see profiling.py), for users marked admin with `flask set-admin`
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+    PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", 0.01))
+    PROFILING_INTERVAL = float(os.environ.get("PROFILING_INTERVAL", 0.001))  # seconds between stack samples
+    PROFILING_STORAGE_PATH = os.environ.get("PROFILING_STORAGE_PATH")  # default: <instance>/profiling.sqlite
+
+    # Experimental: run the dashboard's counters concurrently through a pooled async engine
+    # (aiosqlite / psycopg async) on a per-worker event loop; see asgi.py and async_db.py
+    ASYNC_READS = os.environ.get("ASYNC_READS", "0") == "1"
+
+    # Threads per worker that asgi.py runs Flask requests on
+    ASGI_THREADS = int(os.environ.get("ASGI_THREADS", 10))
+
     # Optional: enable debug mode from env (default off in prod)
     DEBUG = os.environ.get("FLASK_DEBUG", "0") == "1"
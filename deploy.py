@@ -1,8 +1,21 @@
 from flask_migrate import upgrade
 from app import create_app, db
+from models import SkillNeighbor
+from recommendations import refresh_skill_neighbors
 
-app = create_app()
+app = create_app(migrate=True)
 
 # Run migrations before starting the app
 with app.app_context():
     upgrade()
+
+    # Backfill the co-occurrence index once; profile edits keep it current after that.
+    # Skills changed any other way (seed.py, imports, manual SQL) leave it stale until
+    # `flask rebuild-recommendations` is run.
+    if db.session.query(SkillNeighbor).first() is None:
+        refresh_skill_neighbors()
+        db.session.commit()
+
+    # Compile every template once so workers load cached bytecode instead of parsing
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
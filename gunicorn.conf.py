@@ -0,0 +1,17 @@
+# gunicorn.conf.py — picked up automatically when gunicorn starts from the project root
+
+# Import and build the app once in the master; workers fork with it already loaded
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Pooled connections created in the master must not be shared across processes
+    from models import db
+
+    app = server.app.wsgi()
+    app = getattr(app, "app", app)  # unwrap asgi.py's WSGIMiddleware
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+        if "async_db" in app.extensions:
+            app.extensions["async_db"].kw["bind"].sync_engine.dispose(close=False)
@@ -1,5 +1,7 @@
 from models import User, db
+from profiling import phase
 
+@phase("matching")
 def find_matches_for_user(user_id, limit=10):
     """Find best matches for a given user, considering skills + metadata filters."""
     me = db.session.get(User, user_id)
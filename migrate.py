@@ -1,7 +1,8 @@
 # migrate.py
-from app import app, db
+from app import create_app, db
 from sqlalchemy import text
 
+app = create_app()
 with app.app_context():
     try:
         with db.engine.connect() as conn:
@@ -1,7 +1,7 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from sqlalchemy import UniqueConstraint, CheckConstraint
+from sqlalchemy import UniqueConstraint, CheckConstraint, Index
 
 db = SQLAlchemy()
 
@@ -23,6 +23,9 @@ class User(UserMixin, db.Model):
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+    # Granted with `flask set-admin`, never through registration
+    is_admin = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+
     # Skills this user offers
     offered = db.relationship(
         "UserSkill",
@@ -80,6 +83,8 @@ class UserSkill(db.Model):
     __table_args__ = (
         CheckConstraint("relation in ('offer','want')", name="ck_user_skill_relation"),
         UniqueConstraint("user_id", "skill_id", "relation", name="uq_user_skill"),
+        # Reverse lookup (skill -> users); the primary key only covers user_id first
+        Index("ix_user_skill_skill_id_relation", "skill_id", "relation"),
     )
 
 
@@ -100,14 +105,29 @@ class Swap(db.Model):
     offered_skill = db.relationship("Skill", foreign_keys=[offered_skill_id])
     wanted_skill = db.relationship("Skill", foreign_keys=[wanted_skill_id])
 
+    __table_args__ = (
+        # Dashboard counts + sent/received lists filter on one side of the swap and its status
+        Index("ix_swaps_requester_id_status", "requester_id", "status"),
+        Index("ix_swaps_responder_id_status", "responder_id", "status"),
+    )
+
 
 class Review(db.Model):
     """Represents a review left by a user after a swap."""
     __tablename__ = "reviews"
 
     id = db.Column(db.Integer, primary_key=True)
-    swap_id = db.Column(db.Integer, db.ForeignKey("swaps.id", ondelete="CASCADE"), nullable=False)
+    swap_id = db.Column(db.Integer, db.ForeignKey("swaps.id", ondelete="CASCADE"), nullable=False, index=True)
     reviewer_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     rating = db.Column(db.Integer, nullable=False)  # 1–5 stars
     comment = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SkillNeighbor(db.Model):
+    """Top-N co-occurring skills per skill (people linked to one are also linked to the other)."""
+    __tablename__ = "skill_neighbors"
+
+    skill_id = db.Column(db.Integer, db.ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    neighbor_id = db.Column(db.Integer, db.ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    score = db.Column(db.Integer, nullable=False)  # number of users linked to both skills
@@ -0,0 +1,55 @@
+# profile_startup.py
+"""Report where app startup time goes.
+
+Runs `import app; app.create_app()` in a fresh interpreter with `-X importtime`
+and prints the slowest top-level imports plus the factory's own cost.
+
+    python profile_startup.py          # top 15
+    python profile_startup.py 30       # top 30
+"""
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_PROBE = (
+    "import time; t = time.perf_counter(); import app; "
+    "t1 = time.perf_counter(); app.create_app(); t2 = time.perf_counter(); "
+    "print(f'{(t1 - t) * 1e6:.0f} {(t2 - t1) * 1e6:.0f}')"
+)
+
+
+def main():
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        sys.exit(proc.returncode)
+
+    # stderr lines: "import time: <self us> | <cumulative us> | <2 spaces per level><module>"
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        # Level 1 = what `app` imports directly; level 0 = anything create_app() imports
+        if depth <= 1 and name.strip() != "app":
+            imports.append((int(cumulative_us), name.strip()))
+
+    import_us, factory_us = (int(v) for v in proc.stdout.split())
+
+    print(f"import app:    {import_us / 1000:8.1f} ms")
+    print(f"create_app():  {factory_us / 1000:8.1f} ms")
+    print("\nSlowest direct imports (cumulative ms):")
+    for cumulative, name in sorted(imports, reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Opt-in request profiling (PROFILING_ENABLED).
+
+Two modes, both off unless PROFILING_ENABLED=1:
+
+* On demand: an admin (users.is_admin, granted with `flask set-admin`) sends `X-Profile: 1`
+  or `?_profile=1` and gets back the request's sampled stacks in collapsed format
+  ("a;b;c 12" per line), ready for flamegraph.pl or speedscope, with the phase breakdown
+  in a Server-Timing header.
+* Sampling: a random PROFILING_SAMPLE_RATE share of requests record exclusive wall time
+  per phase (matching / query / template / other), aggregated per route across all
+  worker processes (a small SQLite file, PROFILING_STORAGE_PATH) and served as JSON at
+  /_profiling (admins only). Under ASYNC_READS the dashboard runs phases concurrently,
+  so they can add up to more than the wall time.
+"""
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import (abort, before_render_template, current_app, g, jsonify, request,
+                   template_rendered)
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PHASES = ("matching", "query", "template")
+
+# Set only while a profiled/sampled request is running, so phase() is a no-op otherwise
+_timings = ContextVar("profiling_timings", default=None)
+_stack = ContextVar("profiling_stack", default=())
+
+
+@contextmanager
+def phase(name):
+    """Time a block (or, as a decorator, a function) as phase `name`.
+
+    Time is exclusive: a query run inside matching counts as query, not matching.
+    """
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    token = _enter()
+    try:
+        yield
+    finally:
+        _exit(token, name, timings)
+
+
+def _enter():
+    frame = [time.perf_counter(), 0.0]  # start, time spent in nested phases
+    return _stack.set(_stack.get() + (frame,)), frame
+
+
+def _exit(entered, name, timings):
+    token, (start, nested) = entered
+    elapsed = time.perf_counter() - start
+    _stack.reset(token)
+    timings[name] = timings.get(name, 0.0) + elapsed - nested
+    parents = _stack.get()
+    if parents:
+        parents[-1][1] += elapsed
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+
+def _is_admin():
+    return current_user.is_authenticated and current_user.is_admin
+
+
+def _before_request():
+    if request.headers.get("X-Profile") == "1" or request.args.get("_profile") == "1":
+        if _is_admin():
+            g.profile_sampler = StackSampler(threading.get_ident(), current_app.config["PROFILING_INTERVAL"])
+            g.profile_sampler.start()
+        else:
+            return None
+    elif random.random() >= current_app.config["PROFILING_SAMPLE_RATE"]:
+        return None
+
+    g.profile_timings = {}
+    g.profile_token = _timings.set(g.profile_timings)
+    g.profile_start = time.perf_counter()
+    return None
+
+
+def _after_request(response):
+    timings = g.pop("profile_timings", None)
+    if timings is None:
+        return response
+
+    wall = time.perf_counter() - g.pop("profile_start")
+    _timings.reset(g.pop("profile_token"))
+    breakdown = {name: timings.get(name, 0.0) for name in PHASES}
+    breakdown["other"] = max(wall - sum(breakdown.values()), 0.0)
+
+    sampler = g.pop("profile_sampler", None)
+    if sampler is None:
+        rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+        current_app.extensions["profiling"].record(rule, wall, breakdown)
+        return response
+
+    response = current_app.response_class(sampler.stop(), mimetype="text/plain")
+    response.headers["Server-Timing"] = ", ".join(
+        f"{name};dur={seconds * 1000:.2f}" for name, seconds in breakdown.items()
+    )
+    return response
+
+
+def _teardown_request(exc):
+    # after_request doesn't always run when the view raises, and when it does, phases
+    # interrupted by the exception (a template that raised) never popped their frames;
+    # don't leak any of it to the thread's next request
+    if "profile_token" in g:
+        _timings.reset(g.pop("profile_token"))
+    _stack.set(())
+    g.pop("profile_templates", None)
+    sampler = g.pop("profile_sampler", None)
+    if sampler is not None:
+        sampler.stop()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS route_phases (
+    rule TEXT NOT NULL,
+    name TEXT NOT NULL,
+    total REAL NOT NULL,
+    PRIMARY KEY (rule, name)
+) WITHOUT ROWID
+"""
+
+
+class RouteStats:
+    """Per-route phase totals for sampled requests, shared by every worker via SQLite."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        # Same rules as the rate limiter: one connection per thread, none across a fork
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def record(self, rule, wall, breakdown):
+        totals = {"requests": 1, "wall": wall, **breakdown}
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO route_phases (rule, name, total) VALUES (?, ?, ?) "
+                "ON CONFLICT (rule, name) DO UPDATE SET total = total + excluded.total",
+                [(rule, name, value) for name, value in totals.items()],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def summary(self):
+        """Average milliseconds per sampled request, by route and phase."""
+        routes = {}
+        for rule, name, total in self._connection().execute("SELECT rule, name, total FROM route_phases"):
+            routes.setdefault(rule, {})[name] = total
+        return {
+            rule: {
+                "requests": int(totals["requests"]),
+                **{name: round(totals.get(name, 0.0) * 1000 / totals["requests"], 2)
+                   for name in ("wall",) + PHASES + ("other",)},
+            }
+            for rule, totals in routes.items()
+        }
+
+
+def _profiling_report():
+    if not _is_admin():
+        abort(404)
+    stats = current_app.extensions["profiling"]
+    return jsonify(sample_rate=current_app.config["PROFILING_SAMPLE_RATE"], routes=stats.summary())
+
+
+# Queries and template rendering are timed through SQLAlchemy and Flask hooks
+
+def _query_start(conn, cursor, statement, parameters, context, executemany):
+    if _timings.get() is not None:
+        conn.info.setdefault("profiling_phases", []).append(_enter())
+
+
+def _query_end(conn, cursor, statement, parameters, context, executemany):
+    _query_done(conn)
+
+
+def _query_error(context):
+    if context.connection is not None:
+        _query_done(context.connection)
+
+
+def _query_done(conn):
+    timings = _timings.get()
+    pending = conn.info.get("profiling_phases")
+    if timings is not None and pending:
+        _exit(pending.pop(), "query", timings)
+
+
+def _template_start(sender, template, context, **extra):
+    if _timings.get() is not None:
+        g.setdefault("profile_templates", []).append(_enter())
+
+
+def _template_end(sender, template, context, **extra):
+    timings = _timings.get()
+    pending = g.get("profile_templates")
+    if timings is not None and pending:
+        _exit(pending.pop(), "template", timings)
+
+
+def init_profiling(app):
+    """Hook profiling into `app` when PROFILING_ENABLED is set; otherwise do nothing."""
+    if not app.config["PROFILING_ENABLED"]:
+        return
+
+    for name, listener in (("before_cursor_execute", _query_start),
+                           ("after_cursor_execute", _query_end),
+                           ("handle_error", _query_error)):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+    path = app.config["PROFILING_STORAGE_PATH"] or os.path.join(app.instance_path, "profiling.sqlite")
+    app.extensions["profiling"] = RouteStats(path)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    before_render_template.connect(_template_start, app)
+    template_rendered.connect(_template_end, app)
+    app.add_url_rule("/_profiling", "profiling_report", _profiling_report)
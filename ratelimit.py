@@ -0,0 +1,130 @@
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from flask import current_app
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hits (
+    key TEXT NOT NULL,
+    window INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (key, window)
+) WITHOUT ROWID
+"""
+
+
+def parse_limit(spec):
+    """'10/60' -> (10, 60): at most 10 hits per 60 seconds."""
+    count, _, seconds = spec.partition("/")
+    return int(count), int(seconds)
+
+
+class SlidingWindowLimiter:
+    """Sliding-window counters kept in a small SQLite file every worker process shares.
+
+    Each key has a counter per fixed window; the current rate is estimated as the
+    current window's count plus the previous window's count weighted by how much of it
+    still overlaps the sliding window. Only two rows per key are ever read.
+    """
+
+    def __init__(self, path, timeout=5):
+        self.path = path
+        self.timeout = timeout  # seconds to wait for another writer before "database is locked"
+        self._local = threading.local()
+
+    def _connection(self):
+        # One connection per thread (threaded dev server, gthread workers), and never one
+        # inherited across a fork (gunicorn --preload)
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+
+    def hit(self, limits, now=None):
+        """Count one attempt against every (key, "N/seconds") in `limits`.
+
+        Returns 0 if it is allowed, otherwise the seconds to wait before retrying.
+        A rejected attempt is not counted, so the lockout never outlasts the window.
+        """
+        now = time.time() if now is None else now
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            retry_after = 0
+            for key, spec in limits:
+                allowed, seconds = parse_limit(spec)
+                window, elapsed = divmod(now, seconds)
+                current, previous = self._counts(conn, key, int(window))
+                if previous * (1 - elapsed / seconds) + current + 1 > allowed:
+                    retry_after = max(retry_after, int(seconds - elapsed) + 1)
+
+            if not retry_after:
+                for key, spec in limits:
+                    window = int(now // parse_limit(spec)[1])
+                    conn.execute(
+                        "INSERT INTO hits (key, window, count) VALUES (?, ?, 1) "
+                        "ON CONFLICT (key, window) DO UPDATE SET count = count + 1",
+                        (key, window),
+                    )
+
+            # Old windows are never read again; sweep them out now and then
+            if random.random() < 0.01:
+                self._purge(conn, limits, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    @staticmethod
+    def _counts(conn, key, window):
+        rows = dict(conn.execute(
+            "SELECT window, count FROM hits WHERE key = ? AND window IN (?, ?)",
+            (key, window, window - 1),
+        ).fetchall())
+        return rows.get(window, 0), rows.get(window - 1, 0)
+
+    @staticmethod
+    def _purge(conn, limits, now):
+        # Windows are numbered per limit period, so purge each key prefix by its own period.
+        # A range on the prefix ("login-ip:" <= key < "login-ip;") can use the primary key.
+        for key, spec in limits:
+            prefix = key.split(":", 1)[0]
+            conn.execute(
+                "DELETE FROM hits WHERE key >= ? AND key < ? AND window < ?",
+                (prefix + ":", prefix + ";", int(now // parse_limit(spec)[1]) - 1),
+            )
+
+
+def init_ratelimit(app):
+    path = app.config["RATELIMIT_STORAGE_PATH"] or os.path.join(app.instance_path, "ratelimit.sqlite")
+    app.extensions["ratelimit"] = SlidingWindowLimiter(path)
+
+
+def too_many_attempts(*limits):
+    """Count an attempt against `limits`; returns seconds to wait, or 0 if allowed.
+
+    `limits` are (key, config name) pairs, e.g. ("login-ip:1.2.3.4", "RATELIMIT_LOGIN_IP").
+    If the counters can't be reached (e.g. "database is locked" under a heavy burst),
+    the attempt is turned away for RATELIMIT_ERROR_RETRY_AFTER seconds, or let through
+    when RATELIMIT_FAIL_OPEN is set.
+    """
+    if not current_app.config["RATELIMIT_ENABLED"]:
+        return 0
+    try:
+        return current_app.extensions["ratelimit"].hit(
+            [(key, current_app.config[name]) for key, name in limits]
+        )
+    except sqlite3.OperationalError:
+        fail_open = current_app.config["RATELIMIT_FAIL_OPEN"]
+        current_app.logger.exception(
+            "Rate limit store unavailable; %s attempt", "allowing" if fail_open else "rejecting"
+        )
+        return 0 if fail_open else current_app.config["RATELIMIT_ERROR_RETRY_AFTER"]
@@ -0,0 +1,87 @@
+from flask import current_app
+from sqlalchemy import delete, distinct, func, select
+from sqlalchemy.orm import aliased
+
+from models import db, Skill, SkillNeighbor, UserSkill
+
+
+def refresh_skill_neighbors(skill_ids=None):
+    """Recompute the stored top-N neighbors for `skill_ids` (all skills if None).
+
+    Two skills co-occur when the same user offers or wants both. When a user's skills
+    change, every pair whose count moves involves one of that user's old or new skills,
+    so refreshing just those keeps the whole table exact. Does not commit.
+    """
+    if skill_ids is not None and not skill_ids:
+        return
+
+    top_n = current_app.config["SKILL_NEIGHBORS_TOP_N"]
+    mine = aliased(UserSkill)
+    other = aliased(UserSkill)
+
+    stmt = (
+        select(mine.skill_id, other.skill_id, func.count(distinct(other.user_id)))
+        .join(other, (other.user_id == mine.user_id) & (other.skill_id != mine.skill_id))
+        .group_by(mine.skill_id, other.skill_id)
+    )
+    if skill_ids is not None:
+        stmt = stmt.where(mine.skill_id.in_(skill_ids))
+
+    neighbors = {}
+    for skill_id, neighbor_id, score in db.session.execute(stmt):
+        neighbors.setdefault(skill_id, []).append((score, neighbor_id))
+
+    keep = {
+        skill_id: sorted(ranked, key=lambda r: (-r[0], r[1]))[:top_n]
+        for skill_id, ranked in neighbors.items()
+    }
+    if skill_ids is None:
+        skill_ids = set(keep) | set(db.session.scalars(select(distinct(SkillNeighbor.skill_id))))
+
+    # Concurrent profile saves can refresh the same skill. Upsert first, then drop what
+    # fell out of the top N, so two writers never both insert the same key; sorted
+    # order keeps their row locks from deadlocking.
+    rows = [
+        {"skill_id": skill_id, "neighbor_id": neighbor_id, "score": score}
+        for skill_id in sorted(keep)
+        for score, neighbor_id in sorted(keep[skill_id], key=lambda r: r[1])
+    ]
+    if rows:
+        db.session.execute(_upsert_neighbors(), rows)
+
+    for skill_id in sorted(skill_ids):
+        kept_ids = [neighbor_id for _, neighbor_id in keep.get(skill_id, [])]
+        db.session.execute(
+            delete(SkillNeighbor)
+            .where(SkillNeighbor.skill_id == skill_id, SkillNeighbor.neighbor_id.not_in(kept_ids))
+        )
+
+
+def _upsert_neighbors():
+    if db.session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(SkillNeighbor.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["skill_id", "neighbor_id"],
+        set_={"score": stmt.excluded.score},
+    )
+
+
+def recommended_skills_for_user(user_id, limit=6):
+    """Skills most often linked to the user's own skills that they don't have yet."""
+    mine = aliased(UserSkill)
+    owned = select(UserSkill.skill_id).where(UserSkill.user_id == user_id)
+
+    return (
+        Skill.query
+        .join(SkillNeighbor, SkillNeighbor.neighbor_id == Skill.id)
+        .join(mine, mine.skill_id == SkillNeighbor.skill_id)
+        .filter(mine.user_id == user_id, Skill.id.not_in(owned))
+        .group_by(Skill.id)
+        .order_by(func.sum(SkillNeighbor.score).desc(), Skill.id)
+        .limit(limit)
+        .all()
+    )
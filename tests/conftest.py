@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules live at the repository root rather than in a package
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build the real app on a migrated database (a fresh SQLite file unless `database_url`).
+
+    Apps made in the same test share the database, e.g. a sync and an ASYNC_READS app.
+    """
+    from flask_migrate import upgrade
+    from app import create_app
+
+    def make(database_url=None, **config):
+        app = create_app(migrate=True, config={
+            "SQLALCHEMY_DATABASE_URI": database_url or f"sqlite:///{tmp_path / 'app.db'}",
+            "TEMPLATE_CACHE_DIR": str(tmp_path / "jinja_cache"),
+            "RATELIMIT_STORAGE_PATH": str(tmp_path / "ratelimit.sqlite"),
+            "PROFILING_STORAGE_PATH": str(tmp_path / "profiling.sqlite"),
+            "BCRYPT_LOG_ROUNDS": 4,
+            **config,
+        })
+        with app.app_context():
+            upgrade(directory=os.path.join(BASE_DIR, "migrations"))
+        return app
+
+    return make
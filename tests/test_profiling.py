@@ -0,0 +1,71 @@
+import pytest
+from flask import Flask, render_template_string
+
+import profiling
+from profiling import RouteStats, init_profiling
+
+
+def test_route_stats_are_shared_between_processes(tmp_path):
+    # Two instances on one file stand in for two gunicorn workers
+    path = str(tmp_path / "profiling.sqlite")
+    worker_a, worker_b = RouteStats(path), RouteStats(path)
+    worker_a.record("/dashboard", 0.010, {"matching": 0.002, "query": 0.004, "template": 0.001, "other": 0.003})
+    worker_b.record("/dashboard", 0.030, {"matching": 0.006, "query": 0.012, "template": 0.003, "other": 0.009})
+
+    for stats in (worker_a, worker_b):
+        assert stats.summary() == {"/dashboard": {
+            "requests": 2, "wall": 20.0, "matching": 4.0, "query": 8.0, "template": 2.0, "other": 6.0,
+        }}
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = Flask(__name__)
+    app.config.update(PROPAGATE_EXCEPTIONS=False, PROFILING_ENABLED=True,
+                      PROFILING_SAMPLE_RATE=1, PROFILING_INTERVAL=0.001,
+                      PROFILING_STORAGE_PATH=str(tmp_path / "profiling.sqlite"))
+    init_profiling(app)
+
+    @app.route("/broken")
+    def broken():
+        return render_template_string("{{ 1 // 0 }}")
+
+    @app.route("/ok")
+    def ok():
+        return render_template_string("ok")
+
+    return app.test_client()
+
+
+def test_failed_request_leaves_no_phase_state_behind(client):
+    assert client.get("/broken").status_code == 500
+    assert profiling._timings.get() is None
+    assert profiling._stack.get() == ()
+
+    assert client.get("/ok").status_code == 200
+    assert profiling._stack.get() == ()
+
+
+def test_only_users_marked_admin_can_profile(make_app):
+    app = make_app(PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=0)
+    client = app.test_client()
+    client.post("/register", data={"name": "Ops", "email": "ops@example.com", "password": "pw"})
+    client.post("/login", data={"email": "ops@example.com", "password": "pw"})
+
+    # Registering any address, however it is spelled, grants nothing
+    assert client.get("/_profiling").status_code == 404
+    assert client.get("/?_profile=1").mimetype == "text/html"
+
+    result = app.test_cli_runner().invoke(args=["set-admin", "OPS@Example.com "])
+    assert result.exit_code == 0, result.output
+    assert client.get("/_profiling").status_code == 200
+    assert client.get("/?_profile=1").mimetype == "text/plain"
+
+    app.test_cli_runner().invoke(args=["set-admin", "--revoke", "ops@example.com"])
+    assert client.get("/_profiling").status_code == 404
+
+
+def test_set_admin_requires_a_registered_user(make_app):
+    result = make_app().test_cli_runner().invoke(args=["set-admin", "nobody@example.com"])
+    assert result.exit_code != 0
+    assert "No registered user" in result.output
@@ -0,0 +1,175 @@
+"""Query-plan regression tests for the hot paths.
+
+Drives the real routes with the test client on a database built from the Alembic
+migrations, captures every statement they send (on the sync engine and, for the
+ASYNC_READS dashboard, on the async engine too) and runs EXPLAIN / EXPLAIN QUERY PLAN
+on it. A case fails if any statement full-scans a table without an exemption below.
+
+SQLite by default. To check Postgres plans, point QUERY_PLAN_DATABASE_URL at an
+empty scratch database; the tests migrate it, seed it and drop everything afterwards.
+"""
+import os
+import re
+
+import pytest
+from sqlalchemy import event, text
+
+from app import get_bcrypt
+from models import db, User, Skill, Swap, UserSkill, Review
+from recommendations import refresh_skill_neighbors
+
+# (method, path, form data, app config) per case
+HOT_PATHS = {
+    "explore": ("GET", "/explore", None, {}),
+    "explore-category": ("GET", "/explore?category=tech", None, {}),
+    "explore-difficulty": ("GET", "/explore?difficulty=beginner", None, {}),
+    "dashboard": ("GET", "/dashboard", None, {}),
+    "dashboard-async": ("GET", "/dashboard", None, {"ASYNC_READS": True}),
+    "sent-requests": ("GET", "/sent_requests", None, {}),
+    "received-requests": ("GET", "/received_requests", None, {}),
+    "skill-detail": ("GET", "/skill/1", None, {}),
+    # Resubmits the seeded skills, so it runs the refresh_skill_neighbors statements
+    "profile-save": ("POST", "/profile", {"bio": "", "offered": "Python", "wanted": "Guitar"}, {}),
+}
+
+# Full scans that are intentional: (path, table, statement pattern, reason). The
+# pattern must match the whole whitespace-normalised statement, so another query on
+# the same route that scans the same table still fails.
+ALLOWED_SCANS = [
+    ("/explore", "skills",
+     r"SELECT skills\.id AS skills_id, .* FROM skills LEFT OUTER JOIN user_skill AS user_skill_1 "
+     r"ON skills\.id = user_skill_1\.skill_id LEFT OUTER JOIN users AS users_1 ON users_1\.id = user_skill_1\.user_id",
+     "unfiltered listing returns every skill"),
+    ("/dashboard", "users",
+     r"SELECT users\.id AS users_id, .* FROM users WHERE users\.id != \?",
+     "find_matches_for_user scores every other user"),
+]
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)")
+_SQLITE_AUTO_INDEX = re.compile(r"^SEARCH (\w+) USING AUTOMATIC")
+_PG_SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+_ALIAS_SUFFIX = re.compile(r"_\d+$")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+def seed():
+    pw = get_bcrypt().generate_password_hash("pass123").decode("utf-8")
+    me = User(name="Plan", email="plan@example.com", password_hash=pw)
+    other = User(name="Other", email="other@example.com", password_hash=pw)
+    db.session.add_all([me, other])
+
+    python = Skill(name="Python", category="tech", difficulty="beginner", location="Online")
+    guitar = Skill(name="Guitar", category="music", difficulty="advanced", location="Online")
+    db.session.add_all([python, guitar])
+    db.session.flush()
+
+    db.session.add_all([
+        UserSkill(user_id=me.id, skill_id=python.id, relation="offer"),
+        UserSkill(user_id=me.id, skill_id=guitar.id, relation="want"),
+        UserSkill(user_id=other.id, skill_id=guitar.id, relation="offer"),
+        UserSkill(user_id=other.id, skill_id=python.id, relation="want"),
+    ])
+    swap = Swap(requester_id=me.id, responder_id=other.id,
+                offered_skill_id=python.id, wanted_skill_id=guitar.id, status="pending")
+    db.session.add(swap)
+    db.session.flush()
+    db.session.add(Review(swap_id=swap.id, reviewer_id=other.id, rating=5))
+    refresh_skill_neighbors()
+    db.session.commit()
+
+
+@pytest.fixture
+def plan_app(make_app):
+    database_url = os.environ.get("QUERY_PLAN_DATABASE_URL")
+    app = make_app(database_url)
+    with app.app_context():
+        seed()
+    yield app, lambda **config: make_app(database_url, **config)
+
+    if database_url:
+        with app.app_context():
+            db.drop_all()
+            db.session.execute(text("DROP TABLE alembic_version"))
+            db.session.commit()
+
+
+def capture_statements(app, method, path, data):
+    """Send the request and return the distinct statements it ran, with parameters."""
+    seen = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(_EXPLAINABLE):
+            seen.setdefault(statement, parameters[0] if executemany else parameters)
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    if "async_db" in app.extensions:
+        engines.append(app.extensions["async_db"].kw["bind"].sync_engine)
+
+    client = app.test_client()
+    client.post("/login", data={"email": "plan@example.com", "password": "pass123"})
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    try:
+        resp = client.open(path, method=method, data=data)
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", record)
+
+    assert resp.status_code in (200, 302), f"{method} {path} returned {resp.status_code}"
+    return seen
+
+
+def scanned_tables(conn, statement, parameters):
+    """Return the set of tables the planner would full-scan for `statement`.
+
+    Scans of derived tables (e.g. the `anon_1` subquery SQLAlchemy wraps around a
+    LIMITed joinedload) are ignored; only real tables are reported.
+    """
+    tables = set()
+    if conn.dialect.name == "sqlite":
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+        for row in rows:
+            detail = row[-1]
+            m = _SQLITE_SCAN.match(detail) or _SQLITE_AUTO_INDEX.match(detail)
+            if m:
+                tables.add(_ALIAS_SUFFIX.sub("", m.group(1)))
+    else:
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).fetchall()
+        for (line,) in rows:
+            for name in _PG_SEQ_SCAN.findall(line):
+                tables.add(_ALIAS_SUFFIX.sub("", name))
+    return tables & set(db.metadata.tables)
+
+
+def is_allowed(path, table, statement):
+    return any(
+        path == allowed_path and table == allowed_table and re.fullmatch(pattern, statement)
+        for allowed_path, allowed_table, pattern, _ in ALLOWED_SCANS
+    )
+
+
+@pytest.mark.parametrize("case", list(HOT_PATHS))
+def test_no_unexpected_full_scans(plan_app, case):
+    method, path, data, config = HOT_PATHS[case]
+    app, make = plan_app
+    if config:
+        app = make(**config)
+
+    statements = capture_statements(app, method, path, data)
+    assert statements
+
+    route = path.split("?", 1)[0]
+    failures = []
+    with app.app_context(), db.engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # Tiny tables always favour a seq scan; ask whether an index path exists at all
+            conn.exec_driver_sql("SET enable_seqscan = off")
+
+        for statement, parameters in statements.items():
+            statement = " ".join(statement.split())
+            for table in sorted(scanned_tables(conn, statement, parameters)):
+                if not is_allowed(route, table, statement):
+                    failures.append(f"full scan of '{table}': {statement}")
+
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+
+import pytest
+
+from ratelimit import SlidingWindowLimiter, parse_limit
+
+LIMIT = [("login-ip:1.2.3.4", "3/10")]
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    return SlidingWindowLimiter(str(tmp_path / "ratelimit.sqlite"))
+
+
+def test_parse_limit():
+    assert parse_limit("20/60") == (20, 60)
+
+
+def test_blocks_once_limit_reached_with_retry_after(limiter):
+    # Window 10 covers [100, 110)
+    assert [limiter.hit(LIMIT, now=100 + i) for i in range(3)] == [0, 0, 0]
+    assert limiter.hit(LIMIT, now=103) == 8  # 10 - 3 elapsed + 1
+    assert limiter.hit(LIMIT, now=109.5) == 1
+
+
+def test_rejected_attempts_are_not_counted(limiter):
+    for _ in range(3):
+        limiter.hit(LIMIT, now=100)
+    for _ in range(10):
+        assert limiter.hit(LIMIT, now=105)
+    # Only the 3 allowed hits carry over: weight 0.5 at t=115 -> 1.5 + 1 <= 3
+    assert limiter.hit(LIMIT, now=115) == 0
+
+
+def test_previous_window_is_weighted_by_overlap(limiter):
+    for _ in range(3):
+        limiter.hit(LIMIT, now=105)
+    # t=111: 90% of the previous window still overlaps -> 2.7 + 1 > 3
+    assert limiter.hit(LIMIT, now=111) == 10
+    # t=118: 20% overlaps -> 0.6 + 1 <= 3, then 0.6 + 1 + 1 <= 3, then 0.6 + 2 + 1 > 3
+    assert [limiter.hit(LIMIT, now=118) for _ in range(3)] == [0, 0, 3]
+
+
+def test_every_limit_must_pass_and_keys_are_independent(limiter):
+    limits = [("login-ip:1.2.3.4", "10/60"), ("login-email:a@b.c", "2/60")]
+    assert [limiter.hit(limits, now=0) for _ in range(3)] == [0, 0, 61]
+    assert limiter.hit([("login-ip:5.6.7.8", "3/10")], now=0) == 0
+
+
+def test_purge_drops_only_stale_windows_of_the_prefix(limiter):
+    limiter.hit(LIMIT, now=100)
+    limiter.hit(LIMIT, now=125)
+    limiter.hit([("register-ip:1.2.3.4", "5/600")], now=100)
+
+    conn = limiter._connection()
+    limiter._purge(conn, LIMIT, now=125)
+    rows = conn.execute("SELECT key, window FROM hits ORDER BY key, window").fetchall()
+    assert rows == [("login-ip:1.2.3.4", 12), ("register-ip:1.2.3.4", 0)]
+
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN DELETE FROM hits WHERE key >= ? AND key < ? AND window < ?",
+        ("login-ip:", "login-ip;", 11),
+    ).fetchall()
+    assert all(not row[-1].startswith("SCAN") for row in plan)
+
+
+def test_usable_from_several_threads(limiter):
+    errors = []
+
+    def attempt():
+        try:
+            limiter.hit([("login-ip:9.9.9.9", "100/60")], now=0)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=attempt) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    count = limiter._connection().execute("SELECT count FROM hits").fetchone()[0]
+    assert count == 8
+
+
+@pytest.fixture
+def locked_app(make_app):
+    """The app with its limiter's database held by another writer."""
+    def make(**config):
+        app = make_app(**config)
+        path = app.config["RATELIMIT_STORAGE_PATH"]
+        app.extensions["ratelimit"] = SlidingWindowLimiter(path, timeout=0.05)
+        app.extensions["ratelimit"].hit([("warm-up:x", "1/1")], now=0)  # create the schema
+
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        blockers.append(blocker)
+        return app
+
+    blockers = []
+    yield make
+    for blocker in blockers:
+        blocker.rollback()
+        blocker.close()
+
+
+def login(app):
+    return app.test_client().post("/login", data={"email": "nobody@example.com", "password": "x"})
+
+
+def test_locked_store_fails_closed_by_default(locked_app):
+    app = locked_app()
+    resp = login(app)
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == str(app.config["RATELIMIT_ERROR_RETRY_AFTER"])
+
+
+def test_locked_store_can_fail_open(locked_app):
+    resp = login(locked_app(RATELIMIT_FAIL_OPEN=True))
+    assert resp.status_code == 200  # on to the credential check
+    assert b"Invalid credentials" in resp.data
@@ -0,0 +1,47 @@
+import random
+
+from sqlalchemy import select
+
+from app import get_bcrypt
+from models import db, User, SkillNeighbor
+from recommendations import refresh_skill_neighbors
+
+SKILLS = ["Python", "SQL", "Guitar", "Piano", "French", "Spanish", "React", "Photography"]
+
+
+def neighbor_rows():
+    return set(db.session.execute(
+        select(SkillNeighbor.skill_id, SkillNeighbor.neighbor_id, SkillNeighbor.score)
+    ).all())
+
+
+def test_profile_edits_keep_index_equal_to_full_rebuild(make_app):
+    # A small top N so edits also push neighbors in and out of each skill's list
+    app = make_app(SKILL_NEIGHBORS_TOP_N=3, RATELIMIT_ENABLED=False)
+    with app.app_context():
+        pw = get_bcrypt().generate_password_hash("pass123").decode("utf-8")
+        db.session.add_all([User(name=f"User {i}", email=f"u{i}@test", password_hash=pw) for i in range(6)])
+        db.session.commit()
+
+    clients = []
+    for i in range(6):
+        client = app.test_client()
+        client.post("/login", data={"email": f"u{i}@test", "password": "pass123"})
+        clients.append(client)
+
+    rng = random.Random(0)
+    for _ in range(40):
+        picked = rng.sample(SKILLS, rng.randint(0, 5))
+        split = rng.randint(0, len(picked))
+        resp = rng.choice(clients).post("/profile", data={
+            "bio": "", "offered": ", ".join(picked[:split]), "wanted": ", ".join(picked[split:]),
+        })
+        assert resp.status_code == 302
+
+    with app.app_context():
+        incremental = neighbor_rows()
+        assert incremental
+
+        refresh_skill_neighbors()
+        db.session.commit()
+        assert neighbor_rows() == incremental